@@ -4,8 +4,6 @@ A chatbot using Hugging Face Inference API with Mistral-7B
 """
 
 import os
-import gradio as gr
-from huggingface_hub import InferenceClient
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -18,10 +16,18 @@ generation_history = []
 MODEL_ID = "Qwen/Qwen2.5-7B-Instruct"
 HF_TOKEN = os.getenv("HF_API_TOKEN")
 
-# Initialize the inference client
+# Inference client, created on first use
 client = None
-if HF_TOKEN:
-    client = InferenceClient(model=MODEL_ID, token=HF_TOKEN)
+
+
+def get_client():
+    """Return the inference client, creating it on first use."""
+    global client
+    if client is None and HF_TOKEN:
+        from huggingface_hub import InferenceClient
+        client = InferenceClient(model=MODEL_ID, token=HF_TOKEN)
+    return client
+
 
 # Available languages
 LANGUAGES = {
@@ -90,7 +96,7 @@ EXAMPLES_GENERATE = [
 
 def check_api_token():
     """Check if API token is configured."""
-    if not HF_TOKEN or not client:
+    if not HF_TOKEN or not get_client():
         return False, "⚠️ Token API Hugging Face non configuré. Veuillez définir HF_API_TOKEN dans votre fichier .env"
     return True, None
 
@@ -334,7 +340,9 @@ Provide only the translated description."""
 
 def create_interface():
     """Create the Gradio interface with all features."""
-    
+    # Gradio is heavy to import, only load it when the UI is actually built
+    import gradio as gr
+
     custom_css = """
     .highlight-box {border: 2px solid #4CAF50; border-radius: 8px; padding: 10px;}
     .stat-box {background: #f0f0f0; padding: 10px; border-radius: 5px; margin: 5px 0;}
@@ -629,7 +637,22 @@ def create_interface():
     return app
 
 
+_demo = None
+
+
+def __getattr__(name):
+    """Build the Gradio app on first access to `demo`, as done by `gradio app.py`."""
+    global _demo
+    if name == "demo":
+        if _demo is None:
+            _demo = create_interface()
+        return _demo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
+    import gradio as gr
+
     app = create_interface()
     custom_css = """
     .highlight-box {border: 2px solid #4CAF50; border-radius: 8px; padding: 10px;}
@@ -0,0 +1,52 @@
+"""
+Benchmark for the post-processing stage.
+Fails when checking a response takes more than the per-response budget.
+
+Usage: python bench_postprocess.py [--budget-ms 1.0] [--iterations 2000]
+"""
+
+import argparse
+import sys
+import time
+
+from postprocess import postprocess
+
+# Typical answers: preamble + long description, and a clean short one
+SAMPLES = [
+    (
+        "Voici une description pour votre produit :\n\n"
+        + "Le casque XSound offre une réduction de bruit active et une autonomie de 30 heures pour vous accompagner. " * 14
+        + "\n\nNote : cette description peut être adaptée.",
+        "French",
+        (100, 200),
+    ),
+    (
+        "Discover the ProSpeed running shoes, with a cushioned sole and a breathable upper for your daily runs. " * 5,
+        "English",
+        (50, 100),
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce the post-processing time budget")
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    failed = False
+    for text, language, word_range in SAMPLES:
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            postprocess(text, language, word_range)
+        per_call_ms = (time.perf_counter() - start) * 1000 / args.iterations
+        print(f"{len(text.split()):>4} words, {language}: {per_call_ms:.3f} ms per response")
+        failed = failed or per_call_ms > args.budget_ms
+
+    print(f"budget: {args.budget_ms:.3f} ms")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
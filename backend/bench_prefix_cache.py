@@ -0,0 +1,123 @@
+"""
+Prefix-cache benchmark for the prompt layouts.
+Sends the same products through the API with PROMPT_LAYOUT=inline and =prefix and reports
+the share of prompt tokens served from the upstream prefix cache and the latency.
+
+By default the upstream is an in-process mock that simulates block-level prefix caching like vLLM.
+Pass --url to benchmark a self-hosted server instead (vLLM reports cached_tokens when started
+with --enable-prefix-caching --enable-prompt-tokens-details).
+
+Usage: python bench_prefix_cache.py [--url http://localhost:8001/v1/chat/completions] [--rounds 3]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("HF_API_TOKEN", "benchmark")
+os.environ.setdefault("WARMUP_ENABLED", "0")
+os.environ.setdefault("CACHE_ENABLED", "0")
+
+import httpx
+from fastapi.testclient import TestClient
+
+import main
+
+BLOCK_SIZE = 16
+
+PRODUCTS = [
+    ("Casque Bluetooth Premium XSound", "Électronique", "Réduction de bruit active, autonomie 30h, Bluetooth 5.0"),
+    ("Crème Anti-Âge Lumière d'Or", "Beauté & Soins", "Acide hyaluronique, collagène marin, SPF 30"),
+    ("Chaussures de Running ProSpeed", "Sport & Loisirs", "Semelle amortissante, respirant, léger (280g)"),
+    ("Lampe de Bureau LED Lumina", "Maison & Décoration", "Intensité réglable, port USB, bras articulé"),
+]
+TONES = ["Professionnel", "Convivial", "Luxueux", "Technique"]
+LANGUAGES = ["Français", "English", "Español", "Deutsch"]
+
+
+class MockPrefixCache:
+    """Upstream stand-in that caches prompt blocks by chained hash, like vLLM."""
+
+    def __init__(self, base_ms: float = 5.0, per_token_ms: float = 0.05):
+        self.blocks = set()
+        self.base_ms = base_ms
+        self.per_token_ms = per_token_ms
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        tokens = " ".join(f"<{m['role']}> {m['content']}" for m in body["messages"]).split()
+        cached, chain, hit = 0, "", True
+        for i in range(0, len(tokens) - len(tokens) % BLOCK_SIZE, BLOCK_SIZE):
+            chain = hashlib.sha1((chain + " ".join(tokens[i:i + BLOCK_SIZE])).encode()).hexdigest()
+            if hit and chain in self.blocks:
+                cached += BLOCK_SIZE
+            else:
+                hit = False
+                self.blocks.add(chain)
+        # Prefill cost only for the tokens that were not cached
+        time.sleep((self.base_ms + self.per_token_ms * (len(tokens) - cached)) / 1000)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "Description générée pour le produit."}}],
+            "usage": {
+                "prompt_tokens": len(tokens),
+                "completion_tokens": 6,
+                "total_tokens": len(tokens) + 6,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        })
+
+
+def requests_for_round(index: int):
+    """Distinct requests for each round, so that only shared prefixes can hit the cache."""
+    tone, language = TONES[index % len(TONES)], LANGUAGES[index % len(LANGUAGES)]
+    for name, category, features in PRODUCTS:
+        yield "/api/generate", {"product_name": name, "category": category, "features": features, "tone": tone}
+        yield "/api/seo", {"product_name": name, "category": category, "language": language}
+
+
+def run(client: TestClient, layout: str, rounds: int, mock: bool) -> dict:
+    main.PROMPT_LAYOUT = layout
+    if mock:
+        main.http_client.close()
+        main.http_client = httpx.Client(transport=httpx.MockTransport(MockPrefixCache()))
+    prompt_tokens = cached_tokens = 0
+    latencies = []
+    for index in range(rounds):
+        for endpoint, payload in requests_for_round(index):
+            response = client.post(endpoint, json=payload).json()
+            if not response["success"]:
+                raise SystemExit(f"{endpoint} failed: {response['error']}")
+            prompt_tokens += response["usage"]["prompt_tokens"]
+            cached_tokens += response["usage"]["cached_tokens"]
+            latencies.append(response["duration_ms"])
+    return {
+        "hit_rate": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Compare prefix-cache reuse of the prompt layouts")
+    parser.add_argument("--url", help="OpenAI-compatible chat completions URL of a self-hosted server")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.url:
+        main.INFERENCE_URL = args.url
+    # Measure the prompt layout alone, without drafts or regenerations
+    main.POSTPROCESS_MAX_RETRIES = 0
+    main.TIERED_MODE = False
+
+    with TestClient(main.app) as client:
+        for layout in ("inline", "prefix"):
+            result = run(client, layout, args.rounds, mock=not args.url)
+            print(f"{layout:>6}: prefix-cache hit rate {result['hit_rate']:.1%}, "
+                  f"mean {result['mean_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,71 @@
+"""
+Startup benchmark for the FastAPI backend.
+Fails when importing the app exceeds the import-time budget.
+
+Usage: python bench_startup.py [--budget-ms 800] [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "800"))
+
+# Measured in a fresh interpreter so nothing is already cached in sys.modules
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def measure_import_ms() -> float:
+    """Import the app in a fresh interpreter and return the elapsed milliseconds."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def top_imports(limit: int = 10) -> list:
+    """Return the slowest modules reported by -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce the backend import-time budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = sorted(measure_import_ms() for _ in range(args.runs))
+    median = timings[len(timings) // 2]
+    print(f"import main: median {median:.1f} ms, min {timings[0]:.1f} ms, max {timings[-1]:.1f} ms")
+    print(f"budget: {args.budget_ms:.1f} ms")
+
+    if median > args.budget_ms:
+        print("\nSlowest imports (cumulative us):")
+        for cumulative, module in top_imports():
+            print(f"{cumulative:>10} {module}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
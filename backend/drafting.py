@@ -0,0 +1,128 @@
+"""
+Tiered draft-and-verify generation.
+A small local model drafts the output, the remote model is only called when the draft fails the quality checks.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, List, Optional
+
+from quality import META_DESCRIPTION_MAX, META_TITLE_MAX, extract_section, truncate_words
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Small CPU-runnable instruct model, e.g. Qwen/Qwen2.5-0.5B-Instruct (requires transformers)
+DRAFT_MODEL_ID = os.getenv("DRAFT_MODEL_ID", "")
+TIERED_MODE = os.getenv("TIERED_MODE", "0") == "1"
+if TIERED_MODE and not DRAFT_MODEL_ID:
+    # Without a draft model every request would escalate, only adding overhead
+    logger.warning("TIERED_MODE requires DRAFT_MODEL_ID, tiered mode disabled")
+    TIERED_MODE = False
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+# Set when the draft model fails, so that it is not loaded again on every request
+_pipeline_error: Optional[str] = None
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def get_draft_pipeline():
+    """Load the local draft model on first use, None when no model is configured or it failed."""
+    global _pipeline, _pipeline_error
+    if _pipeline is None and DRAFT_MODEL_ID and _pipeline_error is None:
+        with _pipeline_lock:
+            if _pipeline is None and _pipeline_error is None:
+                try:
+                    from transformers import pipeline
+                    _pipeline = pipeline("text-generation", model=DRAFT_MODEL_ID, device="cpu")
+                except Exception as e:
+                    _pipeline_error = str(e)
+                    logger.exception("Could not load draft model %s, drafting disabled", DRAFT_MODEL_ID)
+    return _pipeline
+
+
+def draft_with_local_model(prompt: str, max_tokens: int, system: Optional[str] = None) -> Optional[str]:
+    """Generate a draft with the local model, None when it is unavailable or fails."""
+    pipe = get_draft_pipeline()
+    if pipe is None:
+        return None
+    try:
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        output = pipe(messages, max_new_tokens=max_tokens, do_sample=False)
+        return output[0]["generated_text"][-1]["content"].strip()
+    except Exception:
+        logger.exception("Draft generation failed")
+        return None
+
+
+def fill_seo_meta(text: str, product_name: str, category: str) -> str:
+    """Bring meta title and description within their length limits.
+
+    Overlong values are shortened at a word boundary, a missing meta title is filled from a template.
+    """
+    for label, max_chars in (("Meta Title", META_TITLE_MAX), ("Meta Description", META_DESCRIPTION_MAX)):
+        value = extract_section(text, label)
+        if value is not None and len(value) > max_chars:
+            text = text.replace(value, truncate_words(value, max_chars), 1)
+    if extract_section(text, "Meta Title") is None:
+        text += f"\n\n**Meta Title Suggestion**\n{truncate_words(f'{product_name} | {category}', META_TITLE_MAX)}"
+    return text
+
+
+def _record(kind: str, outcome: str, reasons: List[str] = ()):
+    with _stats_lock:
+        entry = _stats.setdefault(kind, {"drafts": 0, "accepted": 0, "escalated": 0, "reasons": {}})
+        entry["drafts"] += 1
+        entry[outcome] += 1
+        for reason in reasons:
+            entry["reasons"][reason] = entry["reasons"].get(reason, 0) + 1
+
+
+def draft_and_verify(
+    kind: str,
+    prompt: str,
+    max_tokens: int,
+    check: Callable[[str], List[str]],
+    fix: Optional[Callable[[str], str]] = None,
+    system: Optional[str] = None,
+) -> Optional[str]:
+    """Return a local draft that passes `check`, or None to escalate to the remote model."""
+    with span("draft", kind=kind) as draft_span:
+        draft = draft_with_local_model(prompt, max_tokens, system)
+        failures = ["no_draft"]
+        if draft is not None:
+            if fix is not None:
+                draft = fix(draft)
+            failures = check(draft)
+        if draft_span is not None:
+            draft_span.set(accepted=not failures, failures=",".join(failures))
+    if failures:
+        _record(kind, "escalated", failures)
+        return None
+    _record(kind, "accepted")
+    return draft
+
+
+def get_drafting_stats() -> dict:
+    """Return draft counts and escalation rate per endpoint."""
+    with _stats_lock:
+        stats = {}
+        for kind, entry in _stats.items():
+            stats[kind] = {
+                **entry,
+                "reasons": dict(entry["reasons"]),
+                "escalation_rate": round(entry["escalated"] / entry["drafts"], 3) if entry["drafts"] else 0.0,
+            }
+    return {
+        "enabled": TIERED_MODE and _pipeline_error is None,
+        "draft_model": DRAFT_MODEL_ID or None,
+        "draft_model_error": _pipeline_error,
+        "endpoints": stats,
+    }
@@ -4,31 +4,238 @@ FastAPI backend for React frontend
 """
 
 import os
-from fastapi import FastAPI, HTTPException
+import hmac
+import json
+import time
+import uuid
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from huggingface_hub import InferenceClient
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.datastructures import Headers, MutableHeaders
 from dotenv import load_dotenv
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from cache import CACHE_ENABLED, cache_key, response_cache
+from drafting import TIERED_MODE, draft_and_verify, fill_seo_meta, get_drafting_stats
+from overload import (
+    count, fallback_description, get_overload_stats, is_degraded, probe_admitted, record_call, should_degrade,
+    should_shed_bulk,
+)
+from profiling import LOOP_MONITOR_ENABLED, get_loop_lag_stats, monitor_loop_lag, sample_stacks
+from postprocess import get_postprocess_stats, postprocess, record_regeneration, regeneration_hint, strip_preamble
+from quality import META_DESCRIPTION_MAX, META_TITLE_MAX, check_description, check_seo
+from tracing import current_request_id, finish_trace, span, start_trace, trace_event
+from warmup import get_warmup_status, start_warmup_job
+
+if TYPE_CHECKING:
+    import httpx
 
 load_dotenv()
 
 # Configuration
 MODEL_ID = "Qwen/Qwen2.5-7B-Instruct"
 HF_TOKEN = os.getenv("HF_API_TOKEN")
+# OpenAI-compatible chat completions route (HF router, TGI or vLLM)
+INFERENCE_URL = os.getenv("HF_INFERENCE_URL", "https://router.huggingface.co/v1/chat/completions")
+
+# Maximum concurrent upstream calls, also the connection pool size
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "120"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1"
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+# Extra calls allowed to fix invalid fields of a structured SEO answer
+SEO_MAX_REPAIRS = int(os.getenv("SEO_MAX_REPAIRS", "2"))
+# "prefix": static instructions in a system message and product data last, so that
+# TGI/vLLM can reuse the KV cache of the shared prefix; "inline": one user message, data first
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "prefix")
+# Regenerations allowed when an answer fails the post-processing checks
+POSTPROCESS_MAX_RETRIES = int(os.getenv("POSTPROCESS_MAX_RETRIES", "1"))
+
+# Enables the /admin endpoints when set, sent by clients in the X-Admin-Token header
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Compress responses in the app, for deployments without nginx in front (nginx compresses otherwise)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+
+# Optional faster serialization and Brotli compression
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+# How often handlers check whether the client is still connected
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.5"))
+
+# Pooled HTTP client, created and closed by the application lifespan
+http_client: Optional["httpx.Client"] = None
+
+# Readiness state, filled in by the background warm-up
+_startup_state = {"ready": False, "upstream_warm": False}
+
+_pool_lock = threading.Lock()
+_pool_counters = {"requests": 0, "errors": 0, "cancelled": 0, "in_flight": 0, "waiting": 0}
+# With HTTP/2 a single connection carries many streams, so the pool limits alone do not cap the calls
+_llm_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+# Set when the client of the current request disconnects, checked while streaming from upstream
+_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar("cancel_event", default=None)
+
+
+class RequestCancelled(Exception):
+    """The client disconnected, the remaining upstream work was abandoned."""
+
+
+def raise_cancelled():
+    """Count an abandoned upstream call and raise RequestCancelled."""
+    with _pool_lock:
+        _pool_counters["cancelled"] += 1
+    raise RequestCancelled("Requête annulée par le client")
+
+
+def create_http_client() -> "httpx.Client":
+    """Create the pooled keep-alive client used for all upstream calls."""
+    # Imported here so that importing the module stays cheap on cold starts
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONCURRENCY,
+        max_keepalive_connections=LLM_MAX_CONCURRENCY,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    # Waiting for a free connection is bounded by the concurrency cap, not by a timer
+    timeout = httpx.Timeout(HTTP_TIMEOUT, connect=10.0, pool=None)
+    return httpx.Client(
+        http2=HTTP2_ENABLED,
+        limits=limits,
+        timeout=timeout,
+        headers={"Authorization": f"Bearer {HF_TOKEN}"},
+    )
+
+
+@contextmanager
+def upstream_slot():
+    """Hold one of the LLM_MAX_CONCURRENCY upstream call slots, waiting for a free one.
+
+    Raises RequestCancelled when the client disconnects while queued, before anything is sent upstream.
+    """
+    cancel = _cancel_event.get()
+    with _pool_lock:
+        _pool_counters["waiting"] += 1
+    try:
+        # Its own span, so that queueing shows apart from the upstream call on the timeline
+        with span("llm.queue"):
+            while not _llm_slots.acquire(timeout=DISCONNECT_POLL_INTERVAL):
+                if cancel is not None and cancel.is_set():
+                    raise_cancelled()
+    finally:
+        with _pool_lock:
+            _pool_counters["waiting"] -= 1
+    with _pool_lock:
+        _pool_counters["in_flight"] += 1
+    try:
+        # The slot may free up just as the client leaves
+        if cancel is not None and cancel.is_set():
+            raise_cancelled()
+        yield
+    finally:
+        with _pool_lock:
+            _pool_counters["in_flight"] -= 1
+        _llm_slots.release()
+
+
+def get_pool_stats() -> dict:
+    """Return upstream call load and connection pool statistics."""
+    with _pool_lock:
+        stats = {
+            "max_concurrency": LLM_MAX_CONCURRENCY,
+            "in_flight": _pool_counters["in_flight"],
+            "waiting": _pool_counters["waiting"],
+            "keepalive_expiry": HTTP_KEEPALIVE_EXPIRY,
+            "http2": HTTP2_ENABLED,
+            "requests": _pool_counters["requests"],
+            "errors": _pool_counters["errors"],
+            "cancelled": _pool_counters["cancelled"],
+            # Connection states, several calls may share one connection under HTTP/2
+            "open": 0,
+            "active": 0,
+            "idle": 0,
+        }
+    if http_client is None:
+        return stats
+
+    # httpx does not expose its pool publicly, read the underlying httpcore pool
+    pool = getattr(http_client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for conn in connections if conn.is_idle())
+    stats["open"] = len(connections)
+    stats["idle"] = idle
+    stats["active"] = len(connections) - idle
+    return stats
+
+
+def warm_up():
+    """Open a first upstream connection so the TLS handshake is off the request path."""
+    try:
+        if http_client is not None and WARMUP_ENABLED:
+            models_url = INFERENCE_URL.rsplit("/chat/completions", 1)[0] + "/models"
+            # Any response means the connection is established, the status does not matter
+            http_client.get(models_url, timeout=10.0)
+            _startup_state["upstream_warm"] = True
+    except Exception:
+        pass
+    finally:
+        _startup_state["ready"] = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the upstream connection pool on startup and close it on shutdown."""
+    global http_client
+    if HF_TOKEN:
+        http_client = create_http_client()
+    # Serve /health right away, /ready turns green once the warm-up is done
+    warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    monitor_task = asyncio.create_task(monitor_loop_lag()) if LOOP_MONITOR_ENABLED else None
+    yield
+    if monitor_task is not None:
+        monitor_task.cancel()
+    await warmup_task
+    if http_client is not None:
+        http_client.close()
+        http_client = None
 
-# Initialize the inference client
-client = None
-if HF_TOKEN:
-    client = InferenceClient(model=MODEL_ID, token=HF_TOKEN)
 
 # Initialize FastAPI
 app = FastAPI(
     title="E-commerce Product Description Generator API",
     description="Generate product descriptions using AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # FastAPI versions that deprecate ORJSONResponse serialize response models with Pydantic, which is faster
+    default_response_class=ORJSONResponse if orjson and not hasattr(ORJSONResponse, "__deprecated__") else JSONResponse,
 )
 
+# Compression for deployments without nginx in front (Brotli falls back to gzip)
+if COMPRESSION_ENABLED and BrotliMiddleware:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+elif COMPRESSION_ENABLED:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +245,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class TraceRequestsMiddleware:
+    """Propagate X-Request-ID and record a root span for sampled requests.
+
+    Plain ASGI rather than @app.middleware("http"), which hides client disconnects from the endpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("X-Request-ID") or uuid.uuid4().hex
+        trace = start_trace(request_id)
+        try:
+            with span(f"{scope['method']} {scope['path']}", request_id=request_id) as root:
+                async def send_with_request_id(message):
+                    if message["type"] == "http.response.start":
+                        MutableHeaders(scope=message)["X-Request-ID"] = request_id
+                        if root is not None:
+                            root.set(status_code=message["status"])
+                    await send(message)
+
+                await self.app(scope, receive, send_with_request_id)
+        finally:
+            finish_trace(trace)
+
+
+app.add_middleware(TraceRequestsMiddleware)
+
+
 # Available languages
 LANGUAGES = {
     "Français": "French",
@@ -49,6 +289,66 @@ LANGUAGES = {
     "Nederlands": "Dutch",
 }
 
+# Static instructions, identical for every request so that they form a cacheable prefix
+GENERATE_INSTRUCTIONS = """You are an expert e-commerce copywriter. You write compelling product descriptions.
+
+Requirements:
+- Create an engaging, persuasive description
+- Highlight benefits, not just features
+- Use the specified tone consistently
+- Include a call to action
+- Make it SEO-friendly with natural keyword usage
+- Write in the requested language and respect the requested length
+
+Generate only the product description, no additional commentary."""
+
+IMPROVE_INSTRUCTIONS = """You are an expert e-commerce copywriter. You improve existing product descriptions.
+
+Requirements:
+- Maintain the core product information
+- Enhance readability and engagement
+- Apply the specified improvements
+- Keep the specified tone
+- Make it more persuasive
+
+Provide the improved description only, no explanations."""
+
+SEO_INSTRUCTIONS = """You are an SEO expert for e-commerce. You analyze products and provide SEO recommendations.
+
+Provide:
+1. **Primary Keywords** (5-7 high-value keywords)
+2. **Long-tail Keywords** (5-7 specific phrases)
+3. **Meta Title Suggestion** (max 60 characters)
+4. **Meta Description Suggestion** (max 155 characters)
+5. **SEO Tips** (3-4 specific recommendations for this product)
+
+Format your response clearly with headers."""
+
+SEO_JSON_INSTRUCTIONS = """You are an SEO expert for e-commerce. You analyze products and provide SEO recommendations as JSON.
+
+Respond with a single JSON object with exactly the requested keys.
+Write all values in the target language. Output only the JSON object."""
+
+TRANSLATE_INSTRUCTIONS = """You are a professional translator specialized in e-commerce content.
+
+Requirements:
+- Maintain the persuasive tone and marketing appeal
+- Preserve all product information accurately
+- Keep the same structure and formatting
+
+Provide only the translated description."""
+
+
+def layout_prompt(instructions: str, request_text: str) -> Tuple[Optional[str], str]:
+    """Return the (system, user) messages for the configured PROMPT_LAYOUT."""
+    if PROMPT_LAYOUT == "inline":
+        return None, f"{request_text}\n\n{instructions}"
+    return instructions, request_text
+
+
+OVERLOAD_ERROR = "Service momentanément surchargé, veuillez réessayer dans quelques instants"
+
+
 # Pydantic models for request validation
 class GenerateDescriptionRequest(BaseModel):
     product_name: str
@@ -71,6 +371,7 @@ class SEOKeywordsRequest(BaseModel):
     description: Optional[str] = ""
     category: str
     language: str = "Français"
+    structured: bool = False
 
 class TranslateDescriptionRequest(BaseModel):
     description: str
@@ -78,35 +379,343 @@ class TranslateDescriptionRequest(BaseModel):
     target_language: str = "English"
     adapt_culturally: bool = True
 
+class Usage(BaseModel):
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0
+
+class SEOResult(BaseModel):
+    primary_keywords: List[str] = Field(min_length=1)
+    long_tail_keywords: List[str] = Field(min_length=1)
+    meta_title: str = Field(min_length=1, max_length=META_TITLE_MAX)
+    meta_description: str = Field(min_length=1, max_length=META_DESCRIPTION_MAX)
+    tips: List[str] = Field(min_length=1)
+
 class APIResponse(BaseModel):
     success: bool
     data: Optional[str] = None
+    variants: Optional[List[str]] = None
+    seo: Optional[SEOResult] = None
+    usage: Optional[Usage] = None
+    duration_ms: Optional[float] = None
+    cached: Optional[bool] = None
+    stale: Optional[bool] = None
+    degraded: Optional[bool] = None
     error: Optional[str] = None
 
+class WarmupProduct(BaseModel):
+    product_name: str
+    category: str = "Autre"
+    description: Optional[str] = ""
+    language: str = "Français"
+
+class WarmupRequest(BaseModel):
+    products: List[WarmupProduct]
+    languages: Optional[List[str]] = None
+
 
 def check_api_token():
     """Check if API token is configured."""
-    if not HF_TOKEN or not client:
+    if not HF_TOKEN or not http_client:
         return False, "Token API Hugging Face non configuré"
     return True, None
 
 
-def call_llm(prompt: str, max_tokens: int = 1024) -> str:
-    """Call the LLM via Hugging Face Inference API."""
+def elapsed_ms(start: float) -> float:
+    """Milliseconds elapsed since a time.perf_counter() value."""
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def raise_for_error(payload: dict):
+    """Raise when an upstream payload or stream event carries an error."""
+    error = payload.get("error")
+    if error:
+        message = error.get("message", error) if isinstance(error, dict) else error
+        raise ValueError(f"Erreur du modèle: {message}")
+
+
+def read_completion(response: "httpx.Response") -> dict:
+    """Read a chat completion, streamed (SSE) or not, into the non-streamed payload shape.
+
+    Streams are abandoned as soon as the request is cancelled, which closes the upstream
+    connection so that the server stops generating. Error events and empty answers raise,
+    so that they count as upstream errors.
+    """
+    if not response.headers.get("content-type", "").startswith("text/event-stream"):
+        response.read()
+        payload = response.json()
+        raise_for_error(payload)
+        if not (payload["choices"][0]["message"].get("content") or "").strip():
+            raise ValueError("Réponse vide du modèle")
+        return payload
+
+    cancel = _cancel_event.get()
+    content, usage = [], None
+    for line in response.iter_lines():
+        if cancel is not None and cancel.is_set():
+            raise_cancelled()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        # Read on past [DONE] to the end of the body, so that the connection goes back to the pool
+        if data == "[DONE]":
+            continue
+        chunk = json.loads(data)
+        # TGI and the HF router report failures mid-stream as error events
+        raise_for_error(chunk)
+        usage = chunk.get("usage") or usage
+        for choice in chunk.get("choices", []):
+            content.append((choice.get("delta") or {}).get("content") or "")
+    if not "".join(content).strip():
+        raise ValueError("Réponse vide du modèle")
+    return {"choices": [{"message": {"content": "".join(content)}}], "usage": usage or {}}
+
+
+def call_llm(
+    prompt: str,
+    max_tokens: int = 1024,
+    usage: Optional[Usage] = None,
+    response_format: Optional[dict] = None,
+    system: Optional[str] = None,
+) -> str:
+    """Call the LLM via Hugging Face Inference API.
+
+    When `usage` is given, the token counts reported upstream are added to it.
+    `response_format` is forwarded as is, e.g. {"type": "json_object"}.
+    `system` is sent as a separate system message before the prompt.
+    """
     is_valid, error_msg = check_api_token()
     if not is_valid:
         raise HTTPException(status_code=500, detail=error_msg)
+    cancel = _cancel_event.get()
+    if cancel is not None and cancel.is_set():
+        raise_cancelled()
+
+    with _pool_lock:
+        _pool_counters["requests"] += 1
+    with span("llm.call", max_tokens=max_tokens, prompt_chars=len(prompt)) as llm_span, upstream_slot():
+        started = time.perf_counter()
+        try:
+            messages = [{"role": "user", "content": prompt}]
+            if system:
+                messages.insert(0, {"role": "system", "content": system})
+            body = {
+                "model": MODEL_ID,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": 0.7,
+                # Streaming lets an abandoned request be cut short, see read_completion()
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            }
+            if response_format is not None:
+                body["response_format"] = response_format
+            headers = {"X-Request-ID": current_request_id()} if current_request_id() else None
+            # httpcore connection events show pool waits and handshakes on the timeline
+            extensions = {"trace": lambda event, info: llm_span.add_event(event)} if llm_span else None
+            with http_client.stream(
+                "POST", INFERENCE_URL, json=body, headers=headers, extensions=extensions,
+            ) as response:
+                response.raise_for_status()
+                payload = read_completion(response)
+            record_call(elapsed_ms(started), True)
+            if usage is not None and payload.get("usage"):
+                usage.prompt_tokens += payload["usage"].get("prompt_tokens", 0)
+                usage.completion_tokens += payload["usage"].get("completion_tokens", 0)
+                usage.total_tokens += payload["usage"].get("total_tokens", 0)
+                # Reported by OpenAI-compatible servers with prefix caching (e.g. vLLM)
+                details = payload["usage"].get("prompt_tokens_details") or {}
+                usage.cached_tokens += details.get("cached_tokens") or 0
+            if llm_span is not None:
+                llm_span.set(status_code=response.status_code, **{
+                    key: value for key, value in payload.get("usage", {}).items() if isinstance(value, int)
+                })
+            return payload["choices"][0]["message"]["content"]
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            record_call(elapsed_ms(started), False)
+            with _pool_lock:
+                _pool_counters["errors"] += 1
+            raise HTTPException(status_code=500, detail=f"Erreur lors de l'appel à l'API: {str(e)}")
+
+
+async def run_cancellable(http_request: Optional[Request], func, *args, **kwargs):
+    """Run blocking work in a thread, cancelling its upstream calls if the client disconnects."""
+    cancel = threading.Event()
+    token = _cancel_event.set(cancel)
+    try:
+        # The thread runs in a copy of the current context, so it sees the cancel event
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    finally:
+        _cancel_event.reset(token)
+
+    while http_request is not None and not task.done():
+        await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if not task.done() and await http_request.is_disconnected():
+            cancel.set()
+            break
+    return await task
+
+
+def call_llm_checked(
+    prompt: str,
+    language: str,
+    word_range: Optional[tuple] = None,
+    usage: Optional[Usage] = None,
+    system: Optional[str] = None,
+) -> str:
+    """Call the LLM and post-process the answer, regenerating only when a check fails."""
+    result, failures = postprocess(call_llm(prompt, usage=usage, system=system), language, word_range)
+    for attempt in range(1, POSTPROCESS_MAX_RETRIES + 1):
+        if not failures:
+            break
+        record_regeneration()
+        with span("llm.regenerate", attempt=attempt, failures=",".join(failures)):
+            retry_prompt = f"{prompt}\n\n{regeneration_hint(failures, language, word_range)}"
+            result, failures = postprocess(call_llm(retry_prompt, usage=usage, system=system), language, word_range)
+    return result
+
+
+def cached_response(key: str, allow_stale: bool = False) -> Optional[APIResponse]:
+    """Return the cached response for a request key, if any.
+
+    With `allow_stale`, an expired entry is returned flagged as stale.
+    """
+    if not CACHE_ENABLED:
+        return None
+    cached = response_cache.get(key, allow_stale=allow_stale)
+    if cached is None:
+        return None
+    return APIResponse(success=True, cached=True, stale=allow_stale or None, **cached)
+
+
+def degraded_response(key: str) -> APIResponse:
+    """Serve a request without upstream: stale cached result, or a fast error."""
+    stale = cached_response(key, allow_stale=True)
+    if stale is not None:
+        count("stale")
+        return stale
+    count("rejected")
+    return APIResponse(success=False, degraded=True, error=OVERLOAD_ERROR)
+
+
+def store_response(key: str, response: APIResponse) -> APIResponse:
+    """Cache the content of a successful response and return it unchanged."""
+    content = response.model_dump(include={"data", "variants", "seo"}, exclude_none=True)
+    # An empty answer would be served for the whole TTL
+    if CACHE_ENABLED and response.success and any(value for value in content.values()):
+        response_cache.set(key, content)
+    return response
+
+
+def run_warmup_request(handler, request: BaseModel) -> bool:
+    """Run an endpoint handler from the warm-up thread, which has no event loop of its own.
+
+    The job only starts a request once should_degrade() let it through, so the handler does not check again.
+    """
+    token = probe_admitted.set(True)
+    try:
+        return asyncio.run(handler(request, None)).success
+    finally:
+        probe_admitted.reset(token)
+
+
+def warmup_is_busy() -> bool:
+    """Live traffic first: the warm-up job waits while half of the upstream call slots are taken or
+    bulk work is shed. While overloaded, it still sends the periodic probes."""
+    if get_pool_stats()["in_flight"] >= max(1, LLM_MAX_CONCURRENCY // 2):
+        return True
+    if is_degraded():
+        return should_degrade()
+    return should_shed_bulk()
+
+
+def build_warmup_tasks(products: List[WarmupProduct], languages: List[str]):
+    """SEO analyses and translations of the products for every language, as (cache key, run) pairs."""
+    for product in products:
+        # A JSON null description counts as no description
+        description = product.description or ""
+        for language in languages:
+            seo_request = SEOKeywordsRequest(
+                product_name=product.product_name,
+                description=description,
+                category=product.category,
+                language=language,
+            )
+            yield cache_key("seo", seo_request.model_dump()), partial(run_warmup_request, generate_seo_keywords, seo_request)
+
+            if description.strip() and language != product.language:
+                translate_request = TranslateDescriptionRequest(
+                    description=description,
+                    source_language=product.language,
+                    target_language=language,
+                )
+                yield (
+                    cache_key("translate", translate_request.model_dump()),
+                    partial(run_warmup_request, translate_description, translate_request),
+                )
+
+
+# Instructions for each field of the structured SEO answer
+SEO_FIELD_INSTRUCTIONS = {
+    "primary_keywords": "5-7 high-value keywords (list of strings)",
+    "long_tail_keywords": "5-7 specific long-tail phrases (list of strings)",
+    "meta_title": f"meta title suggestion, max {META_TITLE_MAX} characters (string)",
+    "meta_description": f"meta description suggestion, max {META_DESCRIPTION_MAX} characters (string)",
+    "tips": "3-4 specific SEO recommendations for this product (list of strings)",
+}
 
+
+def parse_json_object(text: str) -> dict:
+    """Extract a JSON object from a model answer, empty dict when there is none."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
     try:
-        messages = [{"role": "user", "content": prompt}]
-        response = client.chat_completion(
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=0.7,
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def generate_seo_structured(request: SEOKeywordsRequest, lang: str, usage: Usage) -> SEOResult:
+    """Generate a validated SEOResult, re-asking only for the fields that failed validation."""
+    product_context = f"""Product Name: {request.product_name}
+Category: {request.category}
+Target Language: {lang}
+Description: {request.description if request.description.strip() else "Not provided"}"""
+
+    valid = {}
+    invalid = {name: None for name in SEOResult.model_fields}
+    for attempt in range(SEO_MAX_REPAIRS + 1):
+        keys = "\n".join(
+            f'- "{name}": {SEO_FIELD_INSTRUCTIONS[name]}'
+            + (f" (previous answer was invalid: {problem})" if problem else "")
+            for name, problem in invalid.items()
         )
-        return response.choices[0].message.content
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur lors de l'appel à l'API: {str(e)}")
+        system, prompt = layout_prompt(SEO_JSON_INSTRUCTIONS, f"""Analyze the following product and provide SEO recommendations.
+
+{product_context}
+
+Keys:
+{keys}""")
+
+        with span("seo.attempt", attempt=attempt, fields=",".join(invalid)):
+            answer = parse_json_object(call_llm(
+                prompt, max_tokens=1000, usage=usage, response_format={"type": "json_object"}, system=system,
+            ))
+        candidate = {**valid, **{name: answer[name] for name in invalid if name in answer}}
+        try:
+            return SEOResult.model_validate(candidate)
+        except ValidationError as e:
+            invalid = {}
+            for error in e.errors():
+                invalid.setdefault(error["loc"][0], error["msg"])
+            valid = {name: value for name, value in candidate.items() if name not in invalid}
+
+    raise HTTPException(status_code=500, detail=f"Réponse SEO invalide: {', '.join(invalid)}")
 
 
 @app.get("/")
@@ -126,8 +735,77 @@ async def health():
     }
 
 
-@app.post("/api/generate", response_model=APIResponse)
-async def generate_description(request: GenerateDescriptionRequest):
+@app.get("/ready")
+async def ready():
+    """Readiness probe, separate from /health which only reports liveness."""
+    status_code = 200 if _startup_state["ready"] else 503
+    return JSONResponse(status_code=status_code, content={
+        "ready": _startup_state["ready"],
+        "upstream_warm": _startup_state["upstream_warm"],
+    })
+
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime statistics used to size the service."""
+    return {
+        "pool": get_pool_stats(),
+        "drafting": get_drafting_stats(),
+        "postprocess": get_postprocess_stats(),
+        "event_loop": get_loop_lag_stats(),
+        "cache": response_cache.stats(),
+        "overload": get_overload_stats(),
+    }
+
+
+def check_admin_token(token: Optional[str]):
+    """Reject admin requests without the configured token."""
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Accès refusé")
+
+
+# Admin endpoints only exist when ADMIN_TOKEN is configured
+if ADMIN_TOKEN:
+    @app.get("/admin/profile")
+    async def profile(
+        seconds: float = Query(10.0, gt=0, le=60),
+        interval_ms: float = Query(10.0, ge=1, le=1000),
+        x_admin_token: Optional[str] = Header(None),
+    ):
+        """Sample all thread stacks under live traffic and return them in folded format."""
+        check_admin_token(x_admin_token)
+        folded = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+        return PlainTextResponse(folded, headers={
+            "Content-Disposition": 'attachment; filename="profile.folded"',
+        })
+
+    @app.post("/admin/warmup")
+    async def warmup(request: WarmupRequest, x_admin_token: Optional[str] = Header(None)):
+        """Precompute cached SEO analyses and translations for popular products."""
+        check_admin_token(x_admin_token)
+        languages = request.languages or list(LANGUAGES)
+        unknown = [language for language in languages if language not in LANGUAGES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Langues inconnues: {', '.join(unknown)}")
+
+        started = start_warmup_job(
+            build_warmup_tasks(request.products, languages),
+            is_cached=response_cache.contains,
+            is_busy=warmup_is_busy,
+        )
+        if not started:
+            raise HTTPException(status_code=409, detail="Un préchauffage est déjà en cours")
+        return get_warmup_status()
+
+    @app.get("/admin/warmup")
+    async def warmup_status(x_admin_token: Optional[str] = Header(None)):
+        """Progress of the current or last warm-up job."""
+        check_admin_token(x_admin_token)
+        return get_warmup_status()
+
+
+@app.post("/api/generate", response_model=APIResponse, response_model_exclude_none=True)
+async def generate_description(request: GenerateDescriptionRequest, http_request: Request):
     """Generate product description from basic information."""
     try:
         if not request.product_name.strip():
@@ -138,13 +816,32 @@ async def generate_description(request: GenerateDescriptionRequest):
             "Moyenne (100-200 mots)": "100 to 200 words",
             "Longue (200-300 mots)": "200 to 300 words",
         }.get(request.length, "100 to 200 words")
+        word_range = {
+            "Courte (50-100 mots)": (50, 100),
+            "Moyenne (100-200 mots)": (100, 200),
+            "Longue (200-300 mots)": (200, 300),
+        }.get(request.length, (100, 200))
 
         lang = LANGUAGES.get(request.language, "French")
 
+        if should_degrade():
+            count("fallback")
+            description = fallback_description(request.product_name, request.category, request.features, lang)
+            return APIResponse(success=True, data=description, degraded=True)
+        if request.num_variants > 1 and should_shed_bulk():
+            # Bulk requests are shed first, only one variant is generated from the lower bulk thresholds on
+            count("shed")
+            request.num_variants = 1
+
+        start = time.perf_counter()
+        usage = Usage()
         results = []
         for i in range(request.num_variants):
-            variant_instruction = f" (Variant {i+1})" if request.num_variants > 1 else ""
-            prompt = f"""You are an expert e-commerce copywriter. Generate a compelling product description{variant_instruction}.
+            with span("variant", index=i + 1):
+                variant_instruction = ""
+                if request.num_variants > 1:
+                    variant_instruction = f" (Variant {i+1}). Make this variant unique and different from others"
+                system, prompt = layout_prompt(GENERATE_INSTRUCTIONS, f"""Generate a compelling product description{variant_instruction}.
 
 Product Name: {request.product_name}
 Category: {request.category}
@@ -152,27 +849,27 @@ Key Features: {request.features if request.features.strip() else "Not specified"
 Target Audience: {request.target_audience if request.target_audience.strip() else "General audience"}
 Tone: {request.tone}
 Language: Write the description in {lang}
-Length: {length_instruction}
-
-Requirements:
-- Create an engaging, persuasive description
-- Highlight benefits, not just features
-- Use the specified tone consistently
-- Include a call to action
-- Make it SEO-friendly with natural keyword usage
-{"- Make this variant unique and different from others" if request.num_variants > 1 else ""}
-
-Generate only the product description, no additional commentary."""
-
-            result = call_llm(prompt)
-            if request.num_variants > 1:
-                results.append(f"=== VARIANTE {i+1} ===\n\n{result}")
-            else:
+Length: {length_instruction}""")
+                trace_event("prompt_built")
+
+                result = None
+                # Short descriptions are drafted locally first, see drafting.py
+                if TIERED_MODE and request.length == "Courte (50-100 mots)":
+                    result = await run_cancellable(
+                        http_request, draft_and_verify, "generate", prompt, 256,
+                        check=lambda text: check_description(text, lang, 50, 100),
+                        fix=strip_preamble,
+                        system=system,
+                    )
+                if result is None:
+                    result = await run_cancellable(
+                        http_request, call_llm_checked, prompt, lang, word_range, usage=usage, system=system,
+                    )
                 results.append(result)
-        
-        final_result = "\n\n".join(results) if request.num_variants > 1 else results[0]
-        
-        return APIResponse(success=True, data=final_result)
+
+        if request.num_variants > 1:
+            return APIResponse(success=True, variants=results, usage=usage, duration_ms=elapsed_ms(start))
+        return APIResponse(success=True, data=results[0], usage=usage, duration_ms=elapsed_ms(start))
     
     except HTTPException as he:
         return APIResponse(success=False, error=he.detail)
@@ -180,8 +877,8 @@ Generate only the product description, no additional commentary."""
         return APIResponse(success=False, error=str(e))
 
 
-@app.post("/api/improve", response_model=APIResponse)
-async def improve_description(request: ImproveDescriptionRequest):
+@app.post("/api/improve", response_model=APIResponse, response_model_exclude_none=True)
+async def improve_description(request: ImproveDescriptionRequest, http_request: Request):
     """Improve an existing product description."""
     try:
         if not request.original_description.strip():
@@ -190,26 +887,24 @@ async def improve_description(request: ImproveDescriptionRequest):
         focus_text = ", ".join(request.improvement_focus) if request.improvement_focus else "general improvement"
         lang = LANGUAGES.get(request.language, "French")
 
-        prompt = f"""You are an expert e-commerce copywriter. Improve the following product description.
+        if should_degrade():
+            count("rejected")
+            return APIResponse(success=False, degraded=True, error=OVERLOAD_ERROR)
 
-Original Description:
-{request.original_description}
+        system, prompt = layout_prompt(IMPROVE_INSTRUCTIONS, f"""Improve the following product description.
 
 Improvement Focus: {focus_text}
 Desired Tone: {request.tone}
 Language: Write in {lang}
 
-Requirements:
-- Maintain the core product information
-- Enhance readability and engagement
-- Apply the specified improvements
-- Keep the specified tone
-- Make it more persuasive
-
-Provide the improved description only, no explanations."""
+Original Description:
+{request.original_description}""")
+        trace_event("prompt_built")
 
-        result = call_llm(prompt)
-        return APIResponse(success=True, data=result)
+        start = time.perf_counter()
+        usage = Usage()
+        result = await run_cancellable(http_request, call_llm_checked, prompt, lang, usage=usage, system=system)
+        return APIResponse(success=True, data=result, usage=usage, duration_ms=elapsed_ms(start))
     
     except HTTPException as he:
         return APIResponse(success=False, error=he.detail)
@@ -217,8 +912,8 @@ Provide the improved description only, no explanations."""
         return APIResponse(success=False, error=str(e))
 
 
-@app.post("/api/seo", response_model=APIResponse)
-async def generate_seo_keywords(request: SEOKeywordsRequest):
+@app.post("/api/seo", response_model=APIResponse, response_model_exclude_none=True)
+async def generate_seo_keywords(request: SEOKeywordsRequest, http_request: Request):
     """Generate SEO keywords and optimization suggestions."""
     try:
         if not request.product_name.strip() and not request.description.strip():
@@ -226,24 +921,42 @@ async def generate_seo_keywords(request: SEOKeywordsRequest):
 
         lang = LANGUAGES.get(request.language, "French")
 
-        prompt = f"""You are an SEO expert for e-commerce. Analyze the following product and provide SEO recommendations.
+        key = cache_key("seo", request.model_dump())
+        cached = cached_response(key)
+        if cached is not None:
+            return cached
+        if should_degrade():
+            return degraded_response(key)
+
+        if request.structured:
+            start = time.perf_counter()
+            usage = Usage()
+            seo = await run_cancellable(http_request, generate_seo_structured, request, lang, usage)
+            return store_response(key, APIResponse(success=True, seo=seo, usage=usage, duration_ms=elapsed_ms(start)))
+
+        system, prompt = layout_prompt(SEO_INSTRUCTIONS, f"""Analyze the following product and provide SEO recommendations.
 
 Product Name: {request.product_name}
 Category: {request.category}
-Description: {request.description if request.description.strip() else "Not provided"}
 Target Language: {lang}
-
-Provide:
-1. **Primary Keywords** (5-7 high-value keywords)
-2. **Long-tail Keywords** (5-7 specific phrases)
-3. **Meta Title Suggestion** (max 60 characters)
-4. **Meta Description Suggestion** (max 155 characters)
-5. **SEO Tips** (3-4 specific recommendations for this product)
-
-Format your response clearly with headers."""
-
-        result = call_llm(prompt, max_tokens=1500)
-        return APIResponse(success=True, data=result)
+Description: {request.description if request.description.strip() else "Not provided"}""")
+        trace_event("prompt_built")
+
+        start = time.perf_counter()
+        usage = Usage()
+        result = None
+        if TIERED_MODE:
+            result = await run_cancellable(
+                http_request, draft_and_verify, "seo", prompt, 768,
+                check=lambda text: check_seo(text, lang),
+                fix=lambda text: fill_seo_meta(text, request.product_name, request.category),
+                system=system,
+            )
+        if result is None:
+            result = await run_cancellable(
+                http_request, call_llm, prompt, max_tokens=1500, usage=usage, system=system,
+            )
+        return store_response(key, APIResponse(success=True, data=result, usage=usage, duration_ms=elapsed_ms(start)))
     
     except HTTPException as he:
         return APIResponse(success=False, error=he.detail)
@@ -251,8 +964,8 @@ Format your response clearly with headers."""
         return APIResponse(success=False, error=str(e))
 
 
-@app.post("/api/translate", response_model=APIResponse)
-async def translate_description(request: TranslateDescriptionRequest):
+@app.post("/api/translate", response_model=APIResponse, response_model_exclude_none=True)
+async def translate_description(request: TranslateDescriptionRequest, http_request: Request):
     """Translate and optionally adapt a product description."""
     try:
         if not request.description.strip():
@@ -264,29 +977,34 @@ async def translate_description(request: TranslateDescriptionRequest):
         source_lang = LANGUAGES.get(request.source_language, "French")
         target_lang = LANGUAGES.get(request.target_language, "English")
 
+        key = cache_key("translate", request.model_dump())
+        cached = cached_response(key)
+        if cached is not None:
+            return cached
+        if should_degrade():
+            return degraded_response(key)
+
         adaptation_instruction = ""
         if request.adapt_culturally:
             adaptation_instruction = """
+
+Cultural adaptation:
 - Adapt cultural references, idioms, and expressions for the target market
 - Adjust measurements, sizes, or formats if relevant
 - Consider local preferences and buying habits"""
 
-        prompt = f"""You are a professional translator specialized in e-commerce content.
+        system, prompt = layout_prompt(TRANSLATE_INSTRUCTIONS, f"""Task: Translate to {target_lang}{adaptation_instruction}
 
 Original Description ({source_lang}):
-{request.description}
+{request.description}""")
+        trace_event("prompt_built")
 
-Task: Translate to {target_lang}
-
-Requirements:
-- Maintain the persuasive tone and marketing appeal
-- Preserve all product information accurately
-- Keep the same structure and formatting{adaptation_instruction}
-
-Provide only the translated description."""
-
-        result = call_llm(prompt)
-        return APIResponse(success=True, data=result)
+        start = time.perf_counter()
+        usage = Usage()
+        result = await run_cancellable(
+            http_request, call_llm_checked, prompt, target_lang, usage=usage, system=system,
+        )
+        return store_response(key, APIResponse(success=True, data=result, usage=usage, duration_ms=elapsed_ms(start)))
     
     except HTTPException as he:
         return APIResponse(success=False, error=he.detail)
@@ -0,0 +1,131 @@
+"""
+Overload detection and degraded responses.
+When upstream latency or error rate crosses its threshold, the API stops waiting on the upstream
+and serves stale cached results or template-based descriptions instead.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+# Configuration
+OVERLOAD_LATENCY_MS = float(os.getenv("OVERLOAD_LATENCY_MS", "20000"))
+OVERLOAD_ERROR_RATE = float(os.getenv("OVERLOAD_ERROR_RATE", "0.5"))
+# Bulk work (extra variants, cache warm-up) is shed from this fraction of both thresholds on,
+# before single requests are degraded
+OVERLOAD_BULK_RATIO = float(os.getenv("OVERLOAD_BULK_RATIO", "0.5"))
+# Number of recent upstream calls the thresholds are computed on
+OVERLOAD_WINDOW = int(os.getenv("OVERLOAD_WINDOW", "20"))
+# Calls older than this many seconds leave the window, so that an idle service recovers
+OVERLOAD_WINDOW_SECONDS = float(os.getenv("OVERLOAD_WINDOW_SECONDS", "60"))
+OVERLOAD_MIN_CALLS = int(os.getenv("OVERLOAD_MIN_CALLS", "5"))
+# While degraded, one request every PROBE_INTERVAL seconds still goes upstream to detect recovery
+OVERLOAD_PROBE_INTERVAL = float(os.getenv("OVERLOAD_PROBE_INTERVAL", "10"))
+
+# Fallback descriptions per language, filled with the product fields
+FALLBACK_TEMPLATES = {
+    "French": ("Découvrez {name}, dans notre sélection {category}.", "Points forts : {features}.", "Commandez dès maintenant !"),
+    "English": ("Discover {name}, from our {category} selection.", "Highlights: {features}.", "Order now!"),
+    "Spanish": ("Descubre {name}, de nuestra selección {category}.", "Puntos fuertes: {features}.", "¡Pídelo ahora!"),
+    "German": ("Entdecken Sie {name} aus unserer Auswahl {category}.", "Highlights: {features}.", "Jetzt bestellen!"),
+    "Italian": ("Scopri {name}, dalla nostra selezione {category}.", "Punti di forza: {features}.", "Ordina ora!"),
+    "Portuguese": ("Descubra {name}, da nossa seleção {category}.", "Destaques: {features}.", "Encomende já!"),
+    "Dutch": ("Ontdek {name} uit onze selectie {category}.", "Hoogtepunten: {features}.", "Bestel nu!"),
+}
+
+_lock = threading.Lock()
+_calls = deque(maxlen=OVERLOAD_WINDOW)
+_last_probe = 0.0
+_counters = {"stale": 0, "fallback": 0, "shed": 0, "rejected": 0}
+
+# Set for work already admitted by should_degrade(), e.g. a warm-up request, so it is not degraded twice
+probe_admitted: ContextVar[bool] = ContextVar("probe_admitted", default=False)
+
+
+def record_call(latency_ms: float, ok: bool):
+    """Record the outcome of an upstream call."""
+    with _lock:
+        _calls.append((time.monotonic(), latency_ms, ok))
+
+
+def _window() -> dict:
+    expired = time.monotonic() - OVERLOAD_WINDOW_SECONDS
+    while _calls and _calls[0][0] < expired:
+        _calls.popleft()
+    calls = len(_calls)
+    errors = sum(1 for _, _, ok in _calls if not ok)
+    avg_latency = sum(latency for _, latency, _ in _calls) / calls if calls else 0.0
+    error_rate = errors / calls if calls else 0.0
+    overloaded = calls >= OVERLOAD_MIN_CALLS and (
+        avg_latency > OVERLOAD_LATENCY_MS or error_rate > OVERLOAD_ERROR_RATE
+    )
+    shedding_bulk = calls >= OVERLOAD_MIN_CALLS and (
+        avg_latency > OVERLOAD_LATENCY_MS * OVERLOAD_BULK_RATIO
+        or error_rate > OVERLOAD_ERROR_RATE * OVERLOAD_BULK_RATIO
+    )
+    return {
+        "calls": calls,
+        "avg_latency_ms": round(avg_latency, 1),
+        "error_rate": round(error_rate, 3),
+        "shedding_bulk": shedding_bulk or overloaded,
+        "overloaded": overloaded,
+    }
+
+
+def is_degraded() -> bool:
+    """Whether upstream is currently considered overloaded."""
+    with _lock:
+        return _window()["overloaded"]
+
+
+def should_shed_bulk() -> bool:
+    """Whether bulk work should be cut, from the lower OVERLOAD_BULK_RATIO thresholds on."""
+    with _lock:
+        return _window()["shedding_bulk"]
+
+
+def should_degrade() -> bool:
+    """Whether this request should be served without upstream, letting periodic probes through."""
+    global _last_probe
+    if probe_admitted.get():
+        return False
+    with _lock:
+        if not _window()["overloaded"]:
+            return False
+        now = time.monotonic()
+        if now - _last_probe >= OVERLOAD_PROBE_INTERVAL:
+            _last_probe = now
+            return False
+        return True
+
+
+def count(outcome: str):
+    """Count a degraded response: stale, fallback, shed or rejected."""
+    with _lock:
+        _counters[outcome] += 1
+
+
+def fallback_description(product_name: str, category: str, features: Optional[str], language: str) -> str:
+    """Build a short description from the product fields, without calling the model."""
+    intro, highlights, call_to_action = FALLBACK_TEMPLATES.get(language, FALLBACK_TEMPLATES["English"])
+    parts = [intro.format(name=product_name.strip(), category=category)]
+    feature_list = [feature.strip() for feature in (features or "").split(",") if feature.strip()]
+    if feature_list:
+        parts.append(highlights.format(features=", ".join(feature_list)))
+    parts.append(call_to_action)
+    return " ".join(parts)
+
+
+def get_overload_stats() -> dict:
+    with _lock:
+        return {
+            **_window(),
+            "latency_threshold_ms": OVERLOAD_LATENCY_MS,
+            "error_rate_threshold": OVERLOAD_ERROR_RATE,
+            "bulk_ratio": OVERLOAD_BULK_RATIO,
+            "window_seconds": OVERLOAD_WINDOW_SECONDS,
+            "degraded_responses": dict(_counters),
+        }
@@ -0,0 +1,127 @@
+"""
+Post-processing of LLM outputs before they are returned.
+Strips preambles, enforces the requested length and checks the language, so that
+only answers that cannot be fixed locally are regenerated.
+"""
+
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from quality import detect_language
+
+# Answers slightly over the limit are trimmed at a sentence end instead of regenerated
+TRIM_TOLERANCE = 1.25
+# Answers slightly under the limit are accepted as is
+SHORT_TOLERANCE = 0.8
+
+# First line starting like a chat reply; only removed when it is also meta, see META_LINE_RE
+PREAMBLE_RE = re.compile(
+    r"\A\s*((?:here(?: is|'s)|sure|certainly|of course|absolutely|voici|bien sûr|certainement|"
+    r"aquí (?:está|tienes)|claro|hier ist|natürlich|ecco|certo|aqui está|hier is|natuurlijk)"
+    r"(?![\w-])[^\n]{0,150})\n+",
+    re.IGNORECASE,
+)
+# Introduces the answer: ends with a colon or talks about the description, translation or version
+META_LINE_RE = re.compile(
+    r":\s*\Z|\b(?:descri|beschr|translat|tradu|übersetz|vertal|version|versie|fassung)",
+    re.IGNORECASE,
+)
+TRAILING_NOTE_RE = re.compile(
+    r"\n+\s*(?:\*\*)?(?:note|remarque|nota|hinweis|opmerking)(?:\*\*)?\s*:[^\n]*\s*\Z",
+    re.IGNORECASE,
+)
+CODE_FENCE_RE = re.compile(r"\A\s*```[a-z]*\n(.*?)\n```\s*\Z", re.DOTALL)
+WORD_SPAN_RE = re.compile(r"\S+")
+SENTENCE_END_RE = re.compile(r"[.!?…](?=[\s\"'»)]|\Z)")
+
+_stats_lock = threading.Lock()
+_stats = {"checked": 0, "stripped": 0, "trimmed": 0, "regenerated": 0, "failures": {}}
+
+
+def strip_preamble(text: str) -> str:
+    """Remove code fences, wrapping quotes, introductory sentences and trailing notes."""
+    fenced = CODE_FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    preamble = PREAMBLE_RE.match(text)
+    if preamble and META_LINE_RE.search(preamble.group(1)):
+        text = text[preamble.end():]
+    text = TRAILING_NOTE_RE.sub("", text)
+    text = text.strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+        text = text[1:-1].strip()
+    return text
+
+
+def trim_to_words(text: str, max_words: int) -> str:
+    """Cut text at the last sentence end within the first `max_words` words."""
+    spans = [match.end() for match in WORD_SPAN_RE.finditer(text)]
+    if len(spans) <= max_words:
+        return text
+    head = text[:spans[max_words - 1]]
+    ends = [match.end() for match in SENTENCE_END_RE.finditer(head)]
+    return head[:ends[-1]] if ends else head
+
+
+def postprocess(
+    text: str,
+    language: Optional[str] = None,
+    word_range: Optional[Tuple[int, int]] = None,
+) -> Tuple[str, List[str]]:
+    """Clean an answer and return it with the checks it still fails."""
+    cleaned = strip_preamble(text)
+    stripped = cleaned != text.strip()
+    failures = []
+    trimmed = False
+
+    if word_range is not None:
+        min_words, max_words = word_range
+        words = len(cleaned.split())
+        if max_words < words <= max_words * TRIM_TOLERANCE:
+            cleaned = trim_to_words(cleaned, max_words)
+            words = len(cleaned.split())
+            trimmed = True
+        if words < min_words * SHORT_TOLERANCE:
+            failures.append("too_short")
+        elif words > max_words:
+            failures.append("too_long")
+
+    if language is not None:
+        detected = detect_language(cleaned)
+        if detected is not None and detected != language:
+            failures.append("language")
+
+    with _stats_lock:
+        _stats["checked"] += 1
+        _stats["stripped"] += stripped
+        _stats["trimmed"] += trimmed
+        for failure in failures:
+            _stats["failures"][failure] = _stats["failures"].get(failure, 0) + 1
+    return cleaned, failures
+
+
+def regeneration_hint(
+    failures: List[str],
+    language: Optional[str] = None,
+    word_range: Optional[Tuple[int, int]] = None,
+) -> str:
+    """Build the extra instructions that target the failed checks."""
+    hints = []
+    if "too_short" in failures or "too_long" in failures:
+        hints.append(f"The answer MUST contain between {word_range[0]} and {word_range[1]} words.")
+    if "language" in failures:
+        hints.append(f"The answer MUST be written entirely in {language}.")
+    hints.append("Output only the requested text, without any introduction or note.")
+    return "IMPORTANT: your previous answer was rejected. " + " ".join(hints)
+
+
+def record_regeneration():
+    with _stats_lock:
+        _stats["regenerated"] += 1
+
+
+def get_postprocess_stats() -> dict:
+    """Return post-processing counters."""
+    with _stats_lock:
+        return {**_stats, "failures": dict(_stats["failures"])}
@@ -0,0 +1,66 @@
+"""
+Event-loop lag monitor and sampling CPU profiler.
+The profiler output uses the folded stack format read by flamegraph.pl and speedscope.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Configuration
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "1") == "1"
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5"))
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+
+_lag_stats = {"samples": 0, "stalls": 0, "last_ms": 0.0, "max_ms": 0.0, "avg_ms": 0.0}
+
+
+async def monitor_loop_lag():
+    """Measure how late the event loop wakes up from a fixed sleep, forever."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LOOP_MONITOR_INTERVAL
+        await asyncio.sleep(LOOP_MONITOR_INTERVAL)
+        lag_ms = max(0.0, (loop.time() - expected) * 1000)
+        _lag_stats["samples"] += 1
+        _lag_stats["last_ms"] = round(lag_ms, 2)
+        _lag_stats["max_ms"] = round(max(_lag_stats["max_ms"], lag_ms), 2)
+        # Exponential moving average, recent stalls weigh more
+        _lag_stats["avg_ms"] = round(_lag_stats["avg_ms"] * 0.9 + lag_ms * 0.1, 2)
+        if lag_ms > LOOP_LAG_THRESHOLD_MS:
+            _lag_stats["stalls"] += 1
+
+
+def get_loop_lag_stats() -> dict:
+    """Return event-loop lag statistics."""
+    return {"enabled": LOOP_MONITOR_ENABLED, "threshold_ms": LOOP_LAG_THRESHOLD_MS, **_lag_stats}
+
+
+def _fold(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def sample_stacks(seconds: float, interval: float = 0.01) -> str:
+    """Sample the stacks of all threads for `seconds` and return them folded.
+
+    Each line is "thread;outer;...;inner count", ready for flamegraph.pl or speedscope.
+    """
+    own_id = threading.get_ident()
+    counts = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            counts[f"{names.get(thread_id, thread_id)};{_fold(frame)}"] += 1
+        time.sleep(interval)
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common()) + "\n"
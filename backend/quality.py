@@ -0,0 +1,105 @@
+"""
+Cheap local quality checks for generated content.
+Pure Python, no model calls.
+"""
+
+import re
+from typing import List, Optional
+
+# Frequent function words per language, enough to tell the supported languages apart
+STOPWORDS = {
+    "French": {"le", "la", "les", "de", "des", "du", "et", "est", "pour", "avec", "une", "un", "dans", "vous", "votre", "qui", "sur", "au", "aux", "en"},
+    "English": {"the", "and", "of", "to", "for", "with", "is", "your", "you", "a", "in", "on", "this", "that", "it", "are", "from", "our", "an", "be"},
+    "Spanish": {"el", "la", "los", "las", "de", "del", "y", "es", "para", "con", "una", "un", "en", "su", "que", "por", "tu", "sus", "al", "se"},
+    "German": {"der", "die", "das", "und", "ist", "für", "mit", "ein", "eine", "in", "ihre", "sie", "den", "dem", "zu", "auf", "von", "nicht", "sich", "auch"},
+    "Italian": {"il", "la", "le", "di", "del", "della", "e", "è", "per", "con", "una", "un", "in", "che", "gli", "sono", "tuo", "tua", "alla", "nel"},
+    "Portuguese": {"o", "a", "os", "as", "de", "do", "da", "e", "é", "para", "com", "uma", "um", "em", "seu", "sua", "que", "por", "no", "na"},
+    "Dutch": {"de", "het", "een", "en", "van", "is", "voor", "met", "in", "op", "uw", "je", "die", "dat", "te", "zijn", "naar", "ook", "niet", "bij"},
+}
+
+# Inverted index so that each word is looked up once for all languages
+STOPWORD_LANGUAGES = {}
+for _lang, _words in STOPWORDS.items():
+    for _word in _words:
+        STOPWORD_LANGUAGES.setdefault(_word, []).append(_lang)
+
+WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# "1." to "5." at the start of a line, optionally inside a Markdown header or bold
+SEO_SECTION_RE = re.compile(r"^\s*(?:#+\s*)?(?:\*\*)?\s*([1-5])[.)]", re.MULTILINE)
+
+META_TITLE_MAX = 60
+META_DESCRIPTION_MAX = 155
+
+
+def count_words(text: str) -> int:
+    """Count words in text, the same way as the Gradio app."""
+    return len(text.split()) if text else 0
+
+
+def detect_language(text: str, min_hits: int = 3) -> Optional[str]:
+    """Guess the language of a text from its stopwords.
+
+    Returns None when the text does not contain enough stopwords to decide.
+    """
+    scores = dict.fromkeys(STOPWORDS, 0)
+    for word in WORD_RE.findall(text.lower()):
+        for lang in STOPWORD_LANGUAGES.get(word, ()):
+            scores[lang] += 1
+    best = max(scores, key=scores.get)
+    if scores[best] < min_hits:
+        return None
+    return best
+
+
+def check_description(text: str, language: str, min_words: int, max_words: int) -> List[str]:
+    """Return the reasons a description fails the checks, empty when it passes."""
+    failures = []
+    words = count_words(text)
+    if words < min_words or words > max_words:
+        failures.append("length")
+    detected = detect_language(text)
+    if detected is not None and detected != language:
+        failures.append("language")
+    return failures
+
+
+def extract_section(text: str, label: str) -> Optional[str]:
+    """Return the first non-empty line following a header containing `label`."""
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if label.lower() in line.lower():
+            # The value may sit on the header line itself, after a colon
+            _, _, inline = line.partition(":")
+            inline = inline.strip(" *")
+            if inline:
+                return inline
+            for following in lines[i + 1:]:
+                value = following.strip(" *-")
+                if value:
+                    return value.strip('"')
+            return None
+    return None
+
+
+def check_seo(text: str, language: str) -> List[str]:
+    """Return the reasons an SEO analysis fails the checks, empty when it passes."""
+    failures = []
+    if len(set(SEO_SECTION_RE.findall(text))) < 5:
+        failures.append("sections")
+    meta_title = extract_section(text, "Meta Title")
+    if not meta_title or len(meta_title) > META_TITLE_MAX:
+        failures.append("meta_title")
+    meta_description = extract_section(text, "Meta Description")
+    if not meta_description or len(meta_description) > META_DESCRIPTION_MAX:
+        failures.append("meta_description")
+    elif detect_language(meta_description, min_hits=2) not in (None, language):
+        failures.append("language")
+    return failures
+
+
+def truncate_words(text: str, max_chars: int) -> str:
+    """Shorten text to at most `max_chars` characters without cutting a word."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars + 1].rsplit(" ", 1)[0].rstrip(" ,;:-")
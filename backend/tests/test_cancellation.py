@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import main
+
+CHUNKS = 100
+
+
+class SlowCompletion(httpx.SyncByteStream):
+    """Streamed completion that takes about two seconds and records how far it was read."""
+
+    def __init__(self):
+        self.requests = 0
+        self.sent = 0
+        self.finished = False
+        self.closed = False
+
+    def __iter__(self):
+        for _ in range(CHUNKS):
+            time.sleep(0.02)
+            self.sent += 1
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': 'mot '}}]})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+        # Only reached when the body is read to the end, which lets httpcore keep the connection
+        self.finished = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    stream = SlowCompletion()
+
+    def handler(request):
+        stream.requests += 1
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=stream)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(main, "HF_TOKEN", "test")
+    monkeypatch.setattr(main, "http_client", httpx.Client(transport=transport))
+    monkeypatch.setattr(main, "DISCONNECT_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(main, "POSTPROCESS_MAX_RETRIES", 0)
+    return stream
+
+
+async def post_then_disconnect(path: str, payload: dict, disconnect_after: float) -> list:
+    """Send a request through the whole ASGI app and hang up after `disconnect_after` seconds."""
+    body = json.dumps(payload).encode()
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+    gone = asyncio.Event()
+    asyncio.get_running_loop().call_later(disconnect_after, gone.set)
+
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await main.app(scope, receive, send)
+    return sent
+
+
+def test_disconnect_aborts_upstream_stream(upstream):
+    cancelled = main.get_pool_stats()["cancelled"]
+    asyncio.run(post_then_disconnect("/api/improve", {"original_description": "Une lampe de bureau LED."}, 0.3))
+    assert upstream.closed
+    assert upstream.sent < CHUNKS
+    assert main.get_pool_stats()["cancelled"] == cancelled + 1
+
+
+def test_connected_client_gets_the_whole_stream(upstream):
+    sent = asyncio.run(post_then_disconnect("/api/improve", {"original_description": "Une lampe de bureau LED."}, 60))
+    assert upstream.sent == CHUNKS
+    assert upstream.finished
+    assert sent[0]["status"] == 200
+    assert any(name == b"x-request-id" for name, _ in sent[0]["headers"])
+
+
+def test_disconnect_while_queued_skips_upstream(upstream, monkeypatch):
+    monkeypatch.setattr(main, "_llm_slots", threading.BoundedSemaphore(1))
+    cancelled = main.get_pool_stats()["cancelled"]
+    payload = {"original_description": "Une lampe de bureau LED."}
+
+    async def both():
+        # The first request holds the only slot, the second one hangs up while waiting for it
+        await asyncio.gather(
+            post_then_disconnect("/api/improve", payload, 60),
+            post_then_disconnect("/api/improve", payload, 0.3),
+        )
+
+    asyncio.run(both())
+    assert upstream.requests == 1
+    assert main.get_pool_stats()["cancelled"] == cancelled + 1
@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+import overload
+
+
+@pytest.fixture(autouse=True)
+def empty_window():
+    overload._calls.clear()
+    yield
+    overload._calls.clear()
+
+
+def test_error_burst_degrades():
+    for _ in range(overload.OVERLOAD_MIN_CALLS):
+        overload.record_call(10.0, False)
+    assert overload.is_degraded()
+
+
+def test_idle_service_recovers(monkeypatch):
+    monkeypatch.setattr(overload, "OVERLOAD_WINDOW_SECONDS", 0.05)
+    for _ in range(overload.OVERLOAD_MIN_CALLS):
+        overload.record_call(10.0, False)
+    time.sleep(0.1)
+    assert not overload.is_degraded()
+    assert overload.get_overload_stats()["calls"] == 0
+
+
+def test_bulk_is_shed_before_single_requests_degrade():
+    # Error rate between the bulk and the full threshold
+    calls = 10
+    errors = int(calls * overload.OVERLOAD_ERROR_RATE * (1 + overload.OVERLOAD_BULK_RATIO) / 2) + 1
+    for i in range(calls):
+        overload.record_call(10.0, i >= errors)
+    assert overload.should_shed_bulk()
+    assert not overload.should_degrade()
@@ -0,0 +1,30 @@
+import pytest
+
+from postprocess import strip_preamble
+
+
+@pytest.mark.parametrize("text", [
+    "Voici le casque qui va changer vos trajets !\n\nAvec sa réduction de bruit active, il vous suit partout.",
+    "Sure-grip gloves for every season.\nThe textured palm keeps your hold on wet handles.",
+    "Certainly the best blender in its class.\nSix speeds and a glass jar of 1.5 litres.",
+    "Of course you deserve comfort.\nOur memory foam pillow adapts to your neck.",
+    "Claro, ligero y resistente.\nEl termo ideal para tus rutas.",
+])
+def test_keeps_legitimate_openers(text):
+    assert strip_preamble(text) == text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Voici une description pour votre produit :\n\nLe casque XSound.", "Le casque XSound."),
+    ("Sure! Here's a compelling product description.\n\nDiscover ProSpeed.", "Discover ProSpeed."),
+    ("Certainly! Here is the translation:\nEntdecken Sie ProSpeed.", "Entdecken Sie ProSpeed."),
+    ("Bien sûr, voici la version améliorée.\n\nLa lampe Lumina.", "La lampe Lumina."),
+    ("Hier ist die Übersetzung:\n\nDer Kopfhörer XSound.", "Der Kopfhörer XSound."),
+])
+def test_strips_meta_preambles(text, expected):
+    assert strip_preamble(text) == expected
+
+
+def test_strips_fences_quotes_and_notes():
+    text = '```\n"Discover ProSpeed."\n\nNote: adapt to your audience.\n```'
+    assert strip_preamble(text) == "Discover ProSpeed."
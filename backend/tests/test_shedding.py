@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+import overload
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Une lampe de bureau LED au design moderne."}}]})
+
+    monkeypatch.setattr(main, "HF_TOKEN", "test")
+    monkeypatch.setattr(main, "http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(main, "POSTPROCESS_MAX_RETRIES", 0)
+    monkeypatch.setattr(main, "TIERED_MODE", False)
+    overload._calls.clear()
+    yield calls
+    overload._calls.clear()
+
+
+def generate(num_variants: int) -> main.APIResponse:
+    request = main.GenerateDescriptionRequest(product_name="Lampe Lumina", category="Maison", num_variants=num_variants)
+    return asyncio.run(main.generate_description(request, None))
+
+
+def record_error_rate(error_rate: float, calls: int = 10):
+    for i in range(calls):
+        overload.record_call(10.0, i >= round(error_rate * calls))
+
+
+def test_bulk_tier_sheds_variants_only(upstream):
+    record_error_rate(overload.OVERLOAD_ERROR_RATE * (1 + overload.OVERLOAD_BULK_RATIO) / 2)
+    response = generate(3)
+    assert response.success and not response.degraded
+    assert response.variants is None and response.data
+    assert len(upstream) == 1
+
+
+def test_overload_tier_serves_template(upstream, monkeypatch):
+    monkeypatch.setattr(overload, "_last_probe", float("inf"))
+    record_error_rate(1.0)
+    response = generate(1)
+    assert response.degraded
+    assert not upstream
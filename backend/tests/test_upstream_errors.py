@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+import cache
+import main
+import overload
+
+
+def stream_of(*events: str) -> httpx.Response:
+    body = "".join(f"data: {event}\n\n" for event in events)
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode())
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    responses = []
+    transport = httpx.MockTransport(lambda request: responses.pop(0))
+    monkeypatch.setattr(main, "HF_TOKEN", "test")
+    monkeypatch.setattr(main, "http_client", httpx.Client(transport=transport))
+    monkeypatch.setattr(main, "response_cache", cache.ResponseCache())
+    monkeypatch.setattr(main, "CACHE_ENABLED", True)
+    monkeypatch.setattr(main, "TIERED_MODE", False)
+    overload._calls.clear()
+    yield responses
+    overload._calls.clear()
+
+
+def seo() -> main.APIResponse:
+    request = main.SEOKeywordsRequest(product_name="Lampe Lumina", category="Maison", language="English")
+    return asyncio.run(main.generate_seo_keywords(request, None))
+
+
+@pytest.mark.parametrize("response", [
+    stream_of('{"error": {"message": "Model is overloaded"}}', "[DONE]"),
+    stream_of('{"choices": [{"delta": {"content": ""}}]}', "[DONE]"),
+    httpx.Response(200, json={"error": "Model is overloaded"}),
+])
+def test_upstream_failure_is_an_error_and_not_cached(upstream, response):
+    upstream.append(response)
+    result = seo()
+    assert not result.success
+    assert overload.get_overload_stats()["error_rate"] == 1.0
+    assert main.response_cache.stats()["entries"] == 0
+
+
+def test_empty_response_is_not_cached(upstream):
+    main.store_response("key", main.APIResponse(success=True, data=""))
+    assert main.response_cache.stats()["entries"] == 0
@@ -0,0 +1,14 @@
+import main
+
+
+def test_null_description_only_warms_seo():
+    products = [main.WarmupProduct(product_name="Lampe Lumina", description=None)]
+    tasks = list(main.build_warmup_tasks(products, ["English", "Deutsch"]))
+    assert len(tasks) == 2
+
+
+def test_description_is_also_translated():
+    products = [main.WarmupProduct(product_name="Lampe Lumina", description="Lampe de bureau LED.")]
+    tasks = list(main.build_warmup_tasks(products, ["Français", "English"]))
+    # SEO in both languages, translation only into the other language
+    assert len(tasks) == 3
@@ -0,0 +1,186 @@
+"""
+Per-request tracing.
+Spans are kept in memory for sampled requests and exported as OpenTelemetry (OTLP/JSON) traces,
+to a local JSONL file or to a collector, from a background thread.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Configuration
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+# OTLP/HTTP JSON endpoint, e.g. http://localhost:4318/v1/traces; exports to TRACE_EXPORT_PATH when empty
+TRACE_COLLECTOR_URL = os.getenv("TRACE_COLLECTOR_URL", "")
+SERVICE_NAME = "ecommerce-description-api"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_export_queue: "queue.Queue[Trace]" = queue.Queue(maxsize=1000)
+_exporter_lock = threading.Lock()
+_exporter_thread: Optional[threading.Thread] = None
+
+
+class Span:
+    """A timed stage of a request."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.events = []
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str):
+        self.events.append((name, time.time_ns()))
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if self.parent_id is None else 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [{"name": name, "timeUnixNano": str(ts)} for name, ts in self.events],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """All spans recorded for one sampled request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        # nginx $request_id is already a 32 hex chars identifier, reuse it as trace id
+        is_hex = len(request_id) == 32 and all(c in "0123456789abcdef" for c in request_id)
+        self.trace_id = request_id if is_hex else uuid.uuid4().hex
+        self.spans = []
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+def start_trace(request_id: str) -> Optional[Trace]:
+    """Bind the request id to the context and start a trace if the request is sampled."""
+    _request_id.set(request_id)
+    if TRACE_SAMPLE_RATE <= 0 or random.random() >= TRACE_SAMPLE_RATE:
+        return None
+    trace = Trace(request_id)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def trace_event(name: str):
+    """Mark a point in time on the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.add_event(name)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record a span under the current one, a no-op for requests that are not sampled."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(name, trace.trace_id, parent.span_id if parent else None, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = getattr(e, "detail", None) or str(e)
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+def to_otlp(trace: Trace) -> dict:
+    """Convert a trace to an OTLP/JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": "backend.tracing"},
+                "spans": [s.to_otlp() for s in trace.spans],
+            }],
+        }]
+    }
+
+
+def finish_trace(trace: Optional[Trace]):
+    """Queue a finished trace for export, dropped when the exporter is behind."""
+    if trace is None:
+        return
+    _ensure_exporter()
+    try:
+        _export_queue.put_nowait(trace)
+    except queue.Full:
+        pass
+
+
+def _ensure_exporter():
+    global _exporter_thread
+    if _exporter_thread is None:
+        with _exporter_lock:
+            if _exporter_thread is None:
+                _exporter_thread = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+                _exporter_thread.start()
+
+
+def _export_loop():
+    client = None
+    if TRACE_COLLECTOR_URL:
+        import httpx
+        client = httpx.Client(timeout=5.0)
+    while True:
+        payload = to_otlp(_export_queue.get())
+        try:
+            if client is not None:
+                client.post(TRACE_COLLECTOR_URL, json=payload)
+            else:
+                with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload) + "\n")
+        except Exception:
+            pass
@@ -0,0 +1,100 @@
+"""
+Cache warm-up job.
+Precomputes responses for a list of popular products at low priority, so that peak-hour
+requests are served from the response cache.
+
+The job runs inside the API process (POST /admin/warmup). From the command line or a cron job:
+
+    python warmup.py products.json [--api http://localhost:8000] [--languages Français English]
+
+products.json is a list of {"product_name", "category", "description", "language"} objects.
+ADMIN_TOKEN must be set in the environment.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+# Configuration
+# Upstream calls per second made by the job
+WARMUP_RATE = float(os.getenv("WARMUP_RATE", "0.5"))
+
+_job_lock = threading.Lock()
+_job = {"running": False, "total": 0, "done": 0, "skipped": 0, "failed": 0, "started_at": None, "finished_at": None}
+
+
+def start_warmup_job(
+    tasks: Iterable[Tuple[str, Callable[[], bool]]],
+    is_cached: Callable[[str], bool],
+    is_busy: Callable[[], bool],
+) -> bool:
+    """Run the tasks in a background thread, False when a job is already running.
+
+    Each task is a (cache key, run) pair; `run` computes and caches the response and returns
+    whether it succeeded. Tasks already cached are skipped, and the job waits while `is_busy()`
+    so that live traffic always has priority.
+    """
+    tasks = list(tasks)
+    with _job_lock:
+        if _job["running"]:
+            return False
+        _job.update(running=True, total=len(tasks), done=0, skipped=0, failed=0,
+                    started_at=time.time(), finished_at=None)
+
+    def run_job():
+        interval = 1 / WARMUP_RATE if WARMUP_RATE > 0 else 0
+        try:
+            for key, run in tasks:
+                if is_cached(key):
+                    _job["skipped"] += 1
+                    continue
+                while is_busy():
+                    time.sleep(1)
+                started = time.monotonic()
+                try:
+                    ok = run()
+                except Exception:
+                    ok = False
+                _job["done" if ok else "failed"] += 1
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            with _job_lock:
+                _job.update(running=False, finished_at=time.time())
+
+    threading.Thread(target=run_job, name="cache-warmup", daemon=True).start()
+    return True
+
+
+def get_warmup_status() -> dict:
+    with _job_lock:
+        return dict(_job)
+
+
+def main(argv: Optional[list] = None):
+    import httpx
+
+    parser = argparse.ArgumentParser(description="Precompute cached responses for popular products")
+    parser.add_argument("products", help="JSON file with the list of products")
+    parser.add_argument("--api", default="http://localhost:8000", help="Base URL of the running API")
+    parser.add_argument("--languages", nargs="*", help="Target languages, all configured languages by default")
+    args = parser.parse_args(argv)
+
+    with open(args.products, encoding="utf-8") as f:
+        products = json.load(f)
+
+    response = httpx.post(
+        f"{args.api}/admin/warmup",
+        json={"products": products, "languages": args.languages},
+        headers={"X-Admin-Token": os.getenv("ADMIN_TOKEN", "")},
+        timeout=30.0,
+    )
+    print(response.status_code, response.text)
+    if response.status_code != 200:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
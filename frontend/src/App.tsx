@@ -64,16 +64,31 @@ function App() {
         response = await api.translateDescription(translateData);
         break;
     }
-    
+
+    // Superseded by a newer request or a tab switch, which own the state now
+    if (response.aborted) {
+      return;
+    }
+
     setLoading(false);
     
-    if (response.success && response.data) {
+    if (response.success && response.variants) {
+      setResult(response.variants.map((variant, i) => `=== VARIANTE ${i + 1} ===\n\n${variant}`).join('\n\n'));
+    } else if (response.success && response.data) {
       setResult(response.data);
     } else {
       setError(response.error || 'Une erreur est survenue');
     }
   };
 
+  const switchTab = (tab: TabType) => {
+    api.cancelAll();
+    setActiveTab(tab);
+    setLoading(false);
+    setResult('');
+    setError('');
+  };
+
   const wordCount = result ? result.split(/\s+/).length : 0;
   const charCount = result.length;
 
@@ -377,25 +392,25 @@ function App() {
       <nav className="navigation">
         <button
           className={`nav-btn ${activeTab === 'generate' ? 'active' : ''}`}
-          onClick={() => { setActiveTab('generate'); setResult(''); setError(''); }}
+          onClick={() => switchTab('generate')}
         >
           📝 Générer
         </button>
         <button
           className={`nav-btn ${activeTab === 'improve' ? 'active' : ''}`}
-          onClick={() => { setActiveTab('improve'); setResult(''); setError(''); }}
+          onClick={() => switchTab('improve')}
         >
           ✨ Améliorer
         </button>
         <button
           className={`nav-btn ${activeTab === 'seo' ? 'active' : ''}`}
-          onClick={() => { setActiveTab('seo'); setResult(''); setError(''); }}
+          onClick={() => switchTab('seo')}
         >
           🔍 SEO
         </button>
         <button
           className={`nav-btn ${activeTab === 'translate' ? 'active' : ''}`}
-          onClick={() => { setActiveTab('translate'); setResult(''); setError(''); }}
+          onClick={() => switchTab('translate')}
         >
           🌍 Traduire
         </button>
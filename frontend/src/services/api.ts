@@ -2,6 +2,13 @@
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || '/api';
 
+// Client-side result cache, keyed by endpoint and request payload
+const CACHE_TTL_MS = 10 * 60 * 1000;
+const CACHE_MAX_ENTRIES = 50;
+// Only endpoints meant to give the same answer for the same input; generating again on
+// an unchanged form must return a new text
+const CACHED_ENDPOINTS = ['/seo', '/translate'];
+
 export interface GenerateRequest {
   product_name: string;
   category: string;
@@ -25,6 +32,7 @@ export interface SEORequest {
   description?: string;
   category: string;
   language: string;
+  structured?: boolean;
 }
 
 export interface TranslateRequest {
@@ -34,14 +42,77 @@ export interface TranslateRequest {
   adapt_culturally: boolean;
 }
 
+export interface Usage {
+  prompt_tokens: number;
+  completion_tokens: number;
+  total_tokens: number;
+  cached_tokens: number;
+}
+
+export interface SEOResult {
+  primary_keywords: string[];
+  long_tail_keywords: string[];
+  meta_title: string;
+  meta_description: string;
+  tips: string[];
+}
+
 export interface APIResponse {
   success: boolean;
   data?: string;
+  variants?: string[];
+  seo?: SEOResult;
+  usage?: Usage;
+  duration_ms?: number;
+  cached?: boolean;
+  stale?: boolean;
+  degraded?: boolean;
+  aborted?: boolean;
   error?: string;
 }
 
 class APIService {
-  private async request(endpoint: string, data: any): Promise<APIResponse> {
+  private cache = new Map<string, { response: APIResponse; expires: number }>();
+  private pending = new Map<string, Promise<APIResponse>>();
+  private controllers = new Map<string, { key: string; controller: AbortController }>();
+
+  private request(endpoint: string, data: any): Promise<APIResponse> {
+    const key = `${endpoint}:${JSON.stringify(data)}`;
+
+    const cacheable = CACHED_ENDPOINTS.includes(endpoint);
+    const cached = cacheable ? this.cache.get(key) : undefined;
+    if (cached && cached.expires > Date.now()) {
+      return Promise.resolve(cached.response);
+    }
+    this.cache.delete(key);
+
+    // Identical request already in flight: share its result
+    const inFlight = this.pending.get(key);
+    if (inFlight) {
+      return inFlight;
+    }
+
+    // A new request on the same endpoint supersedes the previous one, whose backend work is cancelled
+    this.controllers.get(endpoint)?.controller.abort();
+    const controller = new AbortController();
+    this.controllers.set(endpoint, { key, controller });
+
+    const promise = this.send(endpoint, data, controller.signal).then((response) => {
+      if (cacheable && response.success) {
+        this.remember(key, response);
+      }
+      return response;
+    }).finally(() => {
+      this.pending.delete(key);
+      if (this.controllers.get(endpoint)?.key === key) {
+        this.controllers.delete(endpoint);
+      }
+    });
+    this.pending.set(key, promise);
+    return promise;
+  }
+
+  private async send(endpoint: string, data: any, signal: AbortSignal): Promise<APIResponse> {
     try {
       const response = await fetch(`${API_BASE_URL}${endpoint}`, {
         method: 'POST',
@@ -49,6 +120,7 @@ class APIService {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify(data),
+        signal,
       });
 
       if (!response.ok) {
@@ -57,6 +129,9 @@ class APIService {
 
       return await response.json();
     } catch (error) {
+      if (error instanceof DOMException && error.name === 'AbortError') {
+        return { success: false, aborted: true, error: 'Requête annulée' };
+      }
       return {
         success: false,
         error: error instanceof Error ? error.message : 'Une erreur est survenue',
@@ -64,6 +139,23 @@ class APIService {
     }
   }
 
+  private remember(key: string, response: APIResponse) {
+    // Degraded answers are not worth keeping once the backend recovers
+    if (response.stale || response.degraded) {
+      return;
+    }
+    this.cache.set(key, { response, expires: Date.now() + CACHE_TTL_MS });
+    while (this.cache.size > CACHE_MAX_ENTRIES) {
+      this.cache.delete(this.cache.keys().next().value as string);
+    }
+  }
+
+  // Abort all in-flight requests, e.g. when the user leaves the form
+  cancelAll() {
+    this.controllers.forEach(({ controller }) => controller.abort());
+    this.controllers.clear();
+  }
+
   async generateDescription(data: GenerateRequest): Promise<APIResponse> {
     return this.request('/generate', data);
   }